@@ -0,0 +1,249 @@
+import pandas as pd
+import matplotlib.pyplot as plt
+import seaborn as sns
+import math
+import random
+import time
+from statistics import NormalDist
+from HeadlineIO import check_file_exists, iter_csv_chunks, read_csv_columns, HEADLINE_DTYPES
+from ZeroShotModel import load_model, classify_headlines
+from LabelFamilies import LABEL_FAMILIES
+
+# Approximate version of VisualStatistics.py: instead of labeling every headline,
+# label a sample stratified by day (or a wider period for small samples) and report label proportions with confidence
+# intervals. The sample grows progressively until the requested error bound is met.
+
+file_path = "europarl_headlines_max_5000.csv"
+check_file_exists(file_path, "Please ensure the file exists in the current directory.")
+
+# Stop once every label proportion is known to within +/- error_bound
+error_bound = 0.03
+confidence = 0.95
+
+# Sample size for the first round; it doubles each round up to max_sample_size
+initial_sample_size = 500
+max_sample_size = 5000
+
+# Seed for reproducible sampling
+random_seed = 42
+
+output_csv = "approximate_label_distribution.csv"
+
+UNDATED = "undated"
+z_score = NormalDist().inv_cdf(0.5 + confidence / 2)
+
+# Every stratum gets at least this many headlines so its variance can be estimated
+MIN_PER_STRATUM = 2
+
+# Stratum widths to try, finest first: days are merged into wider periods when the
+# first round's sample is too small to give each period MIN_PER_STRATUM headlines
+STRATUM_GRANULARITIES = ["day", "week", "month", "quarter", "year", "all"]
+
+
+def iter_day_chunks():
+    # Stream (headline, day) chunks; rows without a usable date share one stratum
+    has_date = "Date" in read_csv_columns(file_path)
+    columns = ["Headline", "Date"] if has_date else ["Headline"]
+    for chunk in iter_csv_chunks(file_path, columns, HEADLINE_DTYPES):
+        chunk = chunk.dropna(subset=["Headline"])
+        if has_date:
+            days = pd.to_datetime(chunk["Date"], errors="coerce").dt.strftime("%Y-%m-%d").fillna(UNDATED)
+        else:
+            days = pd.Series(UNDATED, index=chunk.index)
+        yield chunk["Headline"], days
+
+
+def stratum_of(day, granularity):
+    # Map a YYYY-MM-DD day to the period that contains it
+    if day == UNDATED or granularity == "day":
+        return day
+    if granularity == "all":
+        return "all"
+    date = pd.Timestamp(day)
+    if granularity == "week":
+        year, week, _ = date.isocalendar()
+        return f"{year}-W{week:02d}"
+    if granularity == "month":
+        return day[:7]
+    if granularity == "quarter":
+        return f"{date.year}-Q{date.quarter}"
+    return day[:4]
+
+
+def choose_strata(day_counts, sample_size):
+    # Finest granularity whose strata can all get MIN_PER_STRATUM headlines from the first round
+    for granularity in STRATUM_GRANULARITIES:
+        day_to_stratum = {day: stratum_of(day, granularity) for day in day_counts}
+        if len(set(day_to_stratum.values())) * MIN_PER_STRATUM <= sample_size:
+            break
+    stratum_counts = {}
+    for day, count in day_counts.items():
+        stratum = day_to_stratum[day]
+        stratum_counts[stratum] = stratum_counts.get(stratum, 0) + count
+    return granularity, day_to_stratum, stratum_counts
+
+
+def allocate(sample_size, stratum_counts, total):
+    # Proportional allocation, with at least MIN_PER_STRATUM headlines per stratum
+    return {
+        stratum: min(count, max(MIN_PER_STRATUM, math.ceil(sample_size * count / total)))
+        for stratum, count in stratum_counts.items()
+    }
+
+
+def wilson_interval(p, n):
+    # Wilson score interval; unlike the normal interval it is not zero-width at p=0 or p=1
+    denominator = 1 + z_score ** 2 / n
+    center = (p + z_score ** 2 / (2 * n)) / denominator
+    half_width = z_score * math.sqrt(p * (1 - p) / n + z_score ** 2 / (4 * n ** 2)) / denominator
+    return max(0.0, center - half_width), min(1.0, center + half_width)
+
+
+def stratified_estimates(family, stratum_counts, total, labeled):
+    # Stratified proportion estimate for every label of a family, with a Wilson CI
+    # computed on the effective sample size of the stratified design
+    rows = []
+    sample_size = sum(len(stratum_labels) for stratum_labels in labeled[family].values())
+    fully_enumerated = all(
+        len(stratum_labels) == stratum_counts[stratum] for stratum, stratum_labels in labeled[family].items()
+    )
+    for label in LABEL_FAMILIES[family]["labels"]:
+        proportion = 0.0
+        variance = 0.0
+        for stratum, stratum_labels in labeled[family].items():
+            n = len(stratum_labels)
+            if n == 0:
+                continue
+            weight = stratum_counts[stratum] / total
+            p = sum(1 for value in stratum_labels if value == label) / n
+            proportion += weight * p
+            if n > 1:
+                finite_population_correction = 1 - n / stratum_counts[stratum]
+                variance += weight ** 2 * finite_population_correction * p * (1 - p) / (n - 1)
+
+        if fully_enumerated:
+            ci_low, ci_high = proportion, proportion
+        else:
+            # Kish effective sample size; falls back to the raw sample size when the
+            # within-stratum variance is zero (e.g. a label never observed)
+            effective_n = proportion * (1 - proportion) / variance if variance > 0 else sample_size
+            ci_low, ci_high = wilson_interval(proportion, max(effective_n, 1))
+
+        rows.append({
+            "family": family,
+            "label": label,
+            "proportion": round(proportion, 4),
+            "ci_low": round(ci_low, 4),
+            "ci_high": round(ci_high, 4),
+            "half_width": round((ci_high - ci_low) / 2, 4),
+        })
+    return rows
+
+
+# Pass 1: count headlines per day (only day -> count is kept in memory)
+print(f"Counting headlines per day in {file_path}")
+day_counts = {}
+for _, days in iter_day_chunks():
+    for day, count in days.value_counts().items():
+        day_counts[day] = day_counts.get(day, 0) + int(count)
+total_headlines = sum(day_counts.values())
+if total_headlines == 0:
+    raise ValueError(f"No headlines found in '{file_path}'.")
+print(f"Found {total_headlines} headlines over {len(day_counts)} days")
+
+sample_size = min(initial_sample_size, max_sample_size)
+granularity, day_to_stratum, stratum_counts = choose_strata(day_counts, sample_size)
+print(f"Stratifying by {granularity}: {len(stratum_counts)} strata")
+
+# Pass 2: reservoir-sample each stratum up to its share of the maximum sample size
+rng = random.Random(random_seed)
+capacity = allocate(max_sample_size, stratum_counts, total_headlines)
+reservoirs = {stratum: [] for stratum in stratum_counts}
+seen = {stratum: 0 for stratum in stratum_counts}
+for headlines, days in iter_day_chunks():
+    for headline, day in zip(headlines, days):
+        stratum = day_to_stratum[day]
+        seen[stratum] += 1
+        if len(reservoirs[stratum]) < capacity[stratum]:
+            reservoirs[stratum].append(headline)
+        else:
+            j = rng.randrange(seen[stratum])
+            if j < capacity[stratum]:
+                reservoirs[stratum][j] = headline
+
+# Shuffle so any prefix of a reservoir is itself a random sample of that stratum
+for reservoir in reservoirs.values():
+    rng.shuffle(reservoir)
+
+model, tokenizer, device = load_model()
+
+# labeled[family][stratum] holds the top label of each sampled headline, in reservoir order
+labeled = {family: {stratum: [] for stratum in stratum_counts} for family in LABEL_FAMILIES}
+start_time = time.time()
+
+while True:
+    # Label only the headlines added to the sample in this round
+    targets = allocate(sample_size, stratum_counts, total_headlines)
+    new_items = []
+    for stratum, target in targets.items():
+        already_labeled = len(labeled["topic"][stratum])
+        new_items.extend((stratum, headline) for headline in reservoirs[stratum][already_labeled:target])
+
+    print(f"\n🔍 Round with sample size {sample_size}: labeling {len(new_items)} new headlines...")
+    new_headlines = [headline for _, headline in new_items]
+    for family, spec in LABEL_FAMILIES.items():
+        predictions = classify_headlines(model, tokenizer, device, new_headlines, spec["labels"], spec["template"])
+        for (stratum, _), scores in zip(new_items, predictions):
+            labeled[family][stratum].append(scores[0][0])
+
+    estimates = [row for family in LABEL_FAMILIES for row in stratified_estimates(family, stratum_counts, total_headlines, labeled)]
+    labeled_count = sum(len(stratum_labels) for stratum_labels in labeled["topic"].values())
+    worst_half_width = max(row["half_width"] for row in estimates)
+    print(f"  ✓ {labeled_count} headlines labeled, widest {confidence:.0%} interval: ±{worst_half_width:.4f} "
+          f"({time.time() - start_time:.1f}s elapsed)")
+
+    if worst_half_width <= error_bound:
+        print(f"Error bound ±{error_bound} reached.")
+        break
+    if labeled_count >= sum(len(reservoir) for reservoir in reservoirs.values()):
+        print(f"⚠️ Sample exhausted at {labeled_count} headlines without reaching ±{error_bound}. "
+              f"Increase max_sample_size for tighter intervals.")
+        break
+    sample_size = min(sample_size * 2, max_sample_size)
+
+# Save the estimates
+df_estimates = pd.DataFrame(estimates)
+df_estimates["sample_size"] = labeled_count
+df_estimates["corpus_size"] = total_headlines
+df_estimates.to_csv(output_csv, index=False)
+print(f"✅ Estimated label distribution from {labeled_count}/{total_headlines} headlines saved to {output_csv}")
+
+# Set style for better visuals
+sns.set(style="whitegrid")
+plt.rcParams.update({'font.size': 12})
+
+# Function to plot an estimated label distribution with its confidence intervals
+def plot_estimated_distribution(family, title, color_palette):
+    family_estimates = df_estimates[df_estimates["family"] == family].sort_values("proportion", ascending=False)
+    lower_errors = family_estimates["proportion"] - family_estimates["ci_low"]
+    upper_errors = family_estimates["ci_high"] - family_estimates["proportion"]
+
+    plt.figure(figsize=(10, 6))
+    plt.bar(family_estimates["label"], family_estimates["proportion"],
+            yerr=[lower_errors, upper_errors], capsize=5,
+            color=sns.color_palette(color_palette, len(family_estimates)))
+    plt.title(f"{title} (≈, n={labeled_count}, {confidence:.0%} CI)", fontsize=16)
+    plt.ylabel("Share of Headlines")
+    plt.xlabel(family.capitalize())
+    plt.xticks(rotation=45)
+    plt.tight_layout()
+    plt.show()
+
+# 🔵 Topic Distribution
+plot_estimated_distribution("topic", "🧠 Topic Distribution", "mako")
+
+# 🟢 Tone Distribution
+plot_estimated_distribution("tone", "🎭 Tone Distribution", "crest")
+
+# 🟣 Frame Distribution
+plot_estimated_distribution("frame", "🧱 Frame Distribution", "viridis")
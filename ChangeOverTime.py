@@ -1,18 +1,33 @@
-import pandas as pd
 import matplotlib.pyplot as plt
 import seaborn as sns
 import os
+from HeadlineIO import read_month_partitions, PARTITION_DIR
 
-# Load your labeled data with dates
-file_path = "labeled_with_dates.csv"
-if not os.path.exists(file_path):
-    raise FileNotFoundError(f"File '{file_path}' not found. Please ensure the labeled data with dates is available.")
+# Monthly partitions to plot: BART labels by default,
+# or "distilled_labeled_by_month" for DistilledClassifier.py output
+partition_dir = PARTITION_DIR
 
-# Read the CSV
-df = pd.read_csv(file_path)
+# Time range to plot, as YYYY-MM (None = no bound)
+start_month = None
+end_month = None
 
-# Convert 'date' to datetime format and create a 'day' column
-df["date"] = pd.to_datetime(df["date"], errors="coerce")
+# Load your labeled data with dates, partitioned by month by the labeling scripts
+if not os.path.isdir(partition_dir):
+    raise FileNotFoundError(f"Directory '{partition_dir}' not found. Please run one of the labeling scripts first.")
+
+# Read only the monthly partitions (and columns) in the requested range
+df = read_month_partitions(["date", "topic", "tone", "frame"], partition_dir, start_month, end_month)
+print(f"Loaded {len(df)} labeled headlines between {start_month or 'the beginning'} and {end_month or 'now'}")
+if df.empty:
+    raise ValueError(
+        f"No labeled headlines found in '{partition_dir}' between {start_month or 'the beginning'} "
+        f"and {end_month or 'now'}. Please check the time range or run one of the labeling scripts first."
+    )
+undated = int(df["date"].isna().sum())
+if undated:
+    print(f"⚠️ {undated} headlines have no date: they appear in the distributions but not in the trends")
+
+# Dates are already parsed from the partitions; create a 'day' column
 df["day"] = df["date"].dt.date
 
 # Check for missing tone values
@@ -0,0 +1,201 @@
+import argparse
+import json
+import math
+import queue
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from ZeroShotModel import load_model, entailment_scores
+from LabelFamilies import LABEL_FAMILIES
+
+# Long-running local zero-shot classification service.
+# Keeps bart-large-mnli loaded and merges concurrent requests from all clients
+# into shared micro-batches. Requests use the same JSON format as the Hugging Face
+# inference API, so LabelTextsWithAPI.py can point at it by setting
+#   CLASSIFIER_URL=http://127.0.0.1:8000/models/facebook/bart-large-mnli
+#
+# Supported payloads (POST, any path):
+#   {"inputs": "headline" or ["headline", ...],
+#    "parameters": {"candidate_labels": [...], "hypothesis_template": "This example is {}."}}
+#   {"inputs": ["headline", ...], "families": ["topic", "tone", "frame"]}
+
+# Same default template as the Hugging Face zero-shot pipeline
+DEFAULT_HYPOTHESIS_TEMPLATE = "This example is {}."
+
+# Work waiting to be batched: each item is a dict with the (headline, hypothesis)
+# pairs of one request, an event to signal completion and the resulting scores
+pending_requests = queue.Queue()
+
+
+def batching_loop(model, tokenizer, device, max_batch_size, max_wait_ms):
+    # Collect requests until the batch is full or the oldest one hits its deadline
+    while True:
+        batch = [pending_requests.get()]
+        batch_pairs = len(batch[0]["pairs"])
+        deadline = time.monotonic() + max_wait_ms / 1000
+
+        while batch_pairs < max_batch_size:
+            remaining = deadline - time.monotonic()
+            if remaining <= 0:
+                break
+            try:
+                request = pending_requests.get(timeout=remaining)
+            except queue.Empty:
+                break
+            batch.append(request)
+            batch_pairs += len(request["pairs"])
+
+        pairs = [pair for request in batch for pair in request["pairs"]]
+        try:
+            scores = entailment_scores(model, tokenizer, device, pairs, batch_size=max_batch_size)
+        except Exception as e:
+            for request in batch:
+                request["error"] = e
+                request["done"].set()
+            continue
+
+        # Hand each request back its own slice of the shared batch
+        offset = 0
+        for request in batch:
+            request["scores"] = scores[offset:offset + len(request["pairs"])]
+            offset += len(request["pairs"])
+            request["done"].set()
+
+
+def score_pairs(pairs):
+    # Queue pairs for the batching thread and wait for their entailment scores
+    request = {"pairs": pairs, "done": threading.Event(), "scores": None, "error": None}
+    pending_requests.put(request)
+    request["done"].wait()
+    if request["error"] is not None:
+        raise request["error"]
+    return request["scores"]
+
+
+def classify(headlines, labels, template):
+    # Zero-shot classify headlines in one queued request, Hugging Face style:
+    # labels sorted by score, scores softmaxed over the candidate labels
+    template = template.replace("{}", "{label}")
+    pairs = [(headline, template.format(label=label)) for headline in headlines for label in labels]
+    scores = score_pairs(pairs)
+
+    results = []
+    for i, headline in enumerate(headlines):
+        logits = scores[i * len(labels):(i + 1) * len(labels)]
+        top_logit = max(logits)
+        exps = [math.exp(logit - top_logit) for logit in logits]
+        probabilities = [value / sum(exps) for value in exps]
+        ranked = sorted(zip(labels, probabilities), key=lambda x: x[1], reverse=True)
+        results.append({
+            "sequence": headline,
+            "labels": [label for label, _ in ranked],
+            "scores": [round(score, 6) for _, score in ranked],
+        })
+    return results
+
+
+def check_hypothesis_template(template):
+    # The template must contain exactly one label placeholder and no other format fields
+    if not isinstance(template, str):
+        raise ValueError("'parameters.hypothesis_template' must be a string")
+    normalized = template.replace("{}", "{label}")
+    try:
+        with_a, with_b = normalized.format(label="a"), normalized.format(label="b")
+    except (KeyError, IndexError, ValueError) as e:
+        raise ValueError(
+            f"Invalid 'parameters.hypothesis_template' {template!r}: it may only contain a '{{}}' "
+            f"placeholder for the label (use '{{{{' and '}}}}' for literal braces) ({e!r})"
+        )
+    if with_a == with_b:
+        raise ValueError(f"'parameters.hypothesis_template' {template!r} has no '{{}}' placeholder for the label")
+
+
+def handle_payload(payload):
+    inputs = payload.get("inputs")
+    single_input = isinstance(inputs, str)
+    headlines = [inputs] if single_input else inputs
+    if not isinstance(headlines, list) or not headlines or not all(isinstance(h, str) for h in headlines):
+        raise ValueError("'inputs' must be a non-empty string or list of strings")
+
+    # Label family request: run every family over the headlines
+    if "families" in payload:
+        families = payload["families"]
+        if isinstance(families, str):
+            families = [families]
+        if not isinstance(families, list) or not families or not all(isinstance(f, str) for f in families):
+            raise ValueError("'families' must be a label family name or a non-empty list of them")
+        unknown = [family for family in families if family not in LABEL_FAMILIES]
+        if unknown:
+            raise ValueError(f"Unknown label families: {unknown}. Available: {list(LABEL_FAMILIES)}")
+        return {
+            family: classify(headlines, LABEL_FAMILIES[family]["labels"], LABEL_FAMILIES[family]["template"])
+            for family in families
+        }
+
+    # Hugging Face inference API request
+    parameters = payload.get("parameters") or {}
+    labels = parameters.get("candidate_labels")
+    if isinstance(labels, str):
+        labels = [label.strip() for label in labels.split(",") if label.strip()]
+    if not labels:
+        raise ValueError("'parameters.candidate_labels' is required")
+    if parameters.get("multi_label"):
+        raise ValueError("multi_label classification is not supported by this server")
+
+    template = parameters.get("hypothesis_template", DEFAULT_HYPOTHESIS_TEMPLATE)
+    check_hypothesis_template(template)
+    results = classify(headlines, labels, template)
+    return results[0] if single_input else results
+
+
+class ClassificationHandler(BaseHTTPRequestHandler):
+    def send_json(self, status, body):
+        data = json.dumps(body).encode("utf-8")
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(data)))
+        self.end_headers()
+        self.wfile.write(data)
+
+    def do_GET(self):
+        self.send_json(200, {"status": "ok", "families": list(LABEL_FAMILIES)})
+
+    def do_POST(self):
+        try:
+            length = int(self.headers.get("Content-Length", 0))
+            payload = json.loads(self.rfile.read(length) or b"{}")
+            if not isinstance(payload, dict):
+                raise ValueError("Request body must be a JSON object")
+            self.send_json(200, handle_payload(payload))
+        except (ValueError, TypeError) as e:
+            self.send_json(400, {"error": str(e)})
+        except Exception as e:
+            print(f"× Error processing request: {e}")
+            self.send_json(500, {"error": str(e)})
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Local bart-large-mnli classification server with micro-batching")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8000)
+    parser.add_argument("--max-batch-size", type=int, default=64,
+                        help="maximum (headline, label) pairs per forward pass")
+    parser.add_argument("--max-wait-ms", type=float, default=20,
+                        help="how long the first queued request may wait for others to join its batch")
+    args = parser.parse_args()
+
+    model, tokenizer, device = load_model()
+    threading.Thread(
+        target=batching_loop,
+        args=(model, tokenizer, device, args.max_batch_size, args.max_wait_ms),
+        daemon=True,
+    ).start()
+
+    server = ThreadingHTTPServer((args.host, args.port), ClassificationHandler)
+    print(f"✅ Serving zero-shot classification on http://{args.host}:{args.port} "
+          f"(batch size {args.max_batch_size}, max wait {args.max_wait_ms} ms)")
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        print("\nShutting down server")
+        server.server_close()
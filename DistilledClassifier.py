@@ -0,0 +1,285 @@
+import argparse
+import glob
+import json
+import os
+import shutil
+import tempfile
+import time
+import joblib
+import pandas as pd
+from sklearn.feature_extraction.text import HashingVectorizer
+from sklearn.linear_model import SGDClassifier
+from sklearn.metrics import accuracy_score, cohen_kappa_score, f1_score
+from sklearn.model_selection import train_test_split
+from HeadlineIO import (
+    iter_csv_chunks, read_csv_columns, check_file_exists, write_month_partitions,
+    HEADLINE_DTYPES, PARTITION_DIR,
+)
+
+# Fast CPU classifier distilled from accumulated bart-large-mnli labels.
+#   python DistilledClassifier.py train   -> fit one linear model per label family
+#   python DistilledClassifier.py label   -> relabel a headline CSV in seconds
+# Features are hashed word n-grams, so there is no vocabulary to fit or store.
+
+MODEL_FILE = "distilled_classifier.joblib"
+METRICS_FILE = "distilled_classifier_metrics.json"
+
+# Labeled outputs of the BART scripts that we learn from
+TRAINING_SOURCES = [
+    "structured_labeled_headlines.csv",
+    "rhetorical_analysis_summary_*.csv",
+    os.path.join(PARTITION_DIR, "*.csv"),
+]
+
+BASE_FAMILIES = ["topic", "tone", "frame"]
+
+# Column added to everything the label command writes, so its predictions can be
+# told apart from BART labels: they are never trained on and never overwritten by accident
+DISTILLED_MARKER_COLUMN = "labeled_by"
+DISTILLED_MARKER = "distilled"
+
+# Families need at least this many labeled headlines to be trained
+MIN_TRAINING_ROWS = 20
+
+
+def make_vectorizer():
+    # Word unigrams/bigrams hashed into a fixed-size sparse space
+    return HashingVectorizer(
+        ngram_range=(1, 2),
+        n_features=2 ** 20,
+        alternate_sign=False,
+        norm="l2",
+        lowercase=True,
+    )
+
+
+def label_families(columns):
+    # topic/tone/frame plus any rhetoric_<category> column (but not their scores)
+    return [
+        col for col in columns
+        if col in BASE_FAMILIES or (col.startswith("rhetoric_") and not col.endswith("_score"))
+    ]
+
+
+def is_distilled_output(path):
+    return DISTILLED_MARKER_COLUMN in read_csv_columns(path)
+
+
+def check_distilled_target(path):
+    # Only files (or directories of partitions) written by the label command may be replaced
+    if os.path.isdir(path):
+        for entry in os.listdir(path):
+            entry_path = os.path.join(path, entry)
+            if not (entry.endswith(".csv") and os.path.isfile(entry_path) and is_distilled_output(entry_path)):
+                raise ValueError(
+                    f"'{path}' contains '{entry}', which was not written by the distilled classifier. "
+                    f"Please choose another output location."
+                )
+    elif os.path.exists(path) and not is_distilled_output(path):
+        raise ValueError(
+            f"'{path}' was not written by the distilled classifier. Please choose another output location."
+        )
+
+
+def load_training_data(sources):
+    # Gather headline -> labels from every labeled file; later files win on duplicates
+    frames = []
+    for pattern in sources:
+        for source_path in sorted(glob.glob(pattern)):
+            columns = read_csv_columns(source_path)
+            if "headline" not in columns:
+                continue
+            if DISTILLED_MARKER_COLUMN in columns:
+                print(f"  Skipping {source_path}: distilled predictions, not BART labels")
+                continue
+            families = label_families(columns)
+            if not families:
+                continue
+            dtypes = {col: "string" for col in ["headline"] + families}
+            for chunk in iter_csv_chunks(source_path, ["headline"] + families, dtypes):
+                frames.append(chunk)
+            print(f"  Loaded labels {families} from {source_path}")
+
+    if not frames:
+        raise FileNotFoundError(
+            f"No labeled headlines found in {sources}. Please run one of the labeling scripts first."
+        )
+    df = pd.concat(frames, ignore_index=True).dropna(subset=["headline"])
+    # Merge rows of the same headline from different files, keeping the latest label per family
+    return df.groupby("headline", sort=False).last().reset_index()
+
+
+def train(sources, test_size, random_state):
+    print("Loading BART labels for distillation...")
+    df = load_training_data(sources)
+    print(f"Loaded {len(df)} unique labeled headlines")
+
+    vectorizer = make_vectorizer()
+    models = {}
+    metrics = {}
+    start_time = time.time()
+
+    for family in [col for col in df.columns if col != "headline"]:
+        family_df = df.dropna(subset=[family])
+        if len(family_df) < MIN_TRAINING_ROWS or family_df[family].nunique() < 2:
+            print(f"⚠️ Skipping {family}: only {len(family_df)} labeled headlines / {family_df[family].nunique()} labels")
+            continue
+
+        headlines = family_df["headline"].tolist()
+        labels = family_df[family].tolist()
+
+        # Stratify the held-out split when every label can appear on both sides of it
+        label_counts = family_df[family].value_counts()
+        can_stratify = label_counts.min() >= 2 and int(len(labels) * test_size) >= len(label_counts)
+        stratify = labels if can_stratify else None
+        train_headlines, test_headlines, train_labels, test_labels = train_test_split(
+            headlines, labels, test_size=test_size, random_state=random_state, stratify=stratify
+        )
+
+        # Held-out agreement with BART
+        clf = SGDClassifier(loss="log_loss", alpha=1e-5, max_iter=50, tol=1e-4, random_state=random_state)
+        clf.fit(vectorizer.transform(train_headlines), train_labels)
+        predictions = clf.predict(vectorizer.transform(test_headlines))
+        metrics[family] = {
+            "train_size": len(train_headlines),
+            "test_size": len(test_headlines),
+            "agreement": round(accuracy_score(test_labels, predictions), 4),
+            "macro_f1": round(f1_score(test_labels, predictions, average="macro", zero_division=0), 4),
+            "cohen_kappa": round(cohen_kappa_score(test_labels, predictions), 4),
+        }
+        print(f"  ✓ {family}: agreement with BART {metrics[family]['agreement']:.2%}, "
+              f"macro F1 {metrics[family]['macro_f1']:.4f}, kappa {metrics[family]['cohen_kappa']:.4f} "
+              f"({len(test_headlines)} held-out headlines)")
+
+        # Refit on all labeled headlines for the saved model
+        final_clf = SGDClassifier(loss="log_loss", alpha=1e-5, max_iter=50, tol=1e-4, random_state=random_state)
+        final_clf.fit(vectorizer.transform(headlines), labels)
+        models[family] = final_clf
+
+    if not models:
+        raise ValueError("No label family had enough labeled headlines to train on.")
+
+    joblib.dump({"models": models, "metrics": metrics}, MODEL_FILE)
+    with open(METRICS_FILE, "w", encoding="utf-8") as f:
+        json.dump(metrics, f, indent=2)
+
+    print(f"Training time: {time.time() - start_time:.1f}s")
+    print(f"✅ Distilled classifier for {list(models)} saved to {MODEL_FILE}, metrics to {METRICS_FILE}")
+
+
+def label(file_path, output_csv, partition_dir):
+    check_file_exists(file_path, "Please ensure the file exists in the current directory.")
+    check_file_exists(MODEL_FILE, "Please run 'python DistilledClassifier.py train' first.")
+
+    bundle = joblib.load(MODEL_FILE)
+    models = bundle["models"]
+    vectorizer = make_vectorizer()
+    print(f"Loaded distilled classifier for {list(models)}")
+    for family, family_metrics in bundle["metrics"].items():
+        print(f"  {family}: held-out agreement with BART {family_metrics['agreement']:.2%}")
+
+    has_date = "Date" in read_csv_columns(file_path)
+    columns = ["Headline", "Date"] if has_date else ["Headline"]
+
+    # Never replace BART outputs; the BART partition directory is refused outright
+    if os.path.abspath(partition_dir) == os.path.abspath(PARTITION_DIR):
+        raise ValueError(f"'{partition_dir}' holds the BART partitions. Please choose another --partition-dir.")
+    check_distilled_target(output_csv)
+    if has_date:
+        check_distilled_target(partition_dir)
+
+    # Build the outputs in fresh temporary paths next to their final location and
+    # swap them in at the end, so an interrupted run leaves the previous results untouched
+    tmp_fd, tmp_csv = tempfile.mkstemp(
+        dir=os.path.dirname(os.path.abspath(output_csv)), prefix=f".{os.path.basename(output_csv)}.", suffix=".tmp"
+    )
+    os.close(tmp_fd)
+    tmp_partition_dir = None
+    if has_date:
+        partition_parent = os.path.dirname(os.path.abspath(partition_dir))
+        os.makedirs(partition_parent, exist_ok=True)
+        tmp_partition_dir = tempfile.mkdtemp(
+            dir=partition_parent, prefix=f".{os.path.basename(os.path.abspath(partition_dir))}.", suffix=".tmp"
+        )
+
+    # mkstemp/mkdtemp create owner-only paths; give the outputs the usual permissions
+    umask = os.umask(0)
+    os.umask(umask)
+    os.chmod(tmp_csv, 0o666 & ~umask)
+    if tmp_partition_dir:
+        os.chmod(tmp_partition_dir, 0o777 & ~umask)
+
+    def remove_temporary_outputs():
+        # Only the temporary paths created above are ever removed here
+        if os.path.exists(tmp_csv):
+            os.remove(tmp_csv)
+        if tmp_partition_dir and os.path.isdir(tmp_partition_dir):
+            shutil.rmtree(tmp_partition_dir)
+
+    start_time = time.time()
+    total = 0
+    try:
+        for chunk in iter_csv_chunks(file_path, columns, HEADLINE_DTYPES):
+            chunk = chunk.dropna(subset=["Headline"])
+            if chunk.empty:
+                continue
+
+            features = vectorizer.transform(chunk["Headline"].tolist())
+            df_labels = pd.DataFrame({"headline": chunk["Headline"].to_numpy()})
+            if has_date:
+                df_labels["date"] = chunk["Date"].to_numpy()
+            df_labels[DISTILLED_MARKER_COLUMN] = DISTILLED_MARKER
+            for family, clf in models.items():
+                probabilities = clf.predict_proba(features)
+                df_labels[family] = clf.classes_[probabilities.argmax(axis=1)]
+                df_labels[f"{family}_confidence"] = probabilities.max(axis=1).round(4)
+
+            df_labels.to_csv(tmp_csv, mode="a", header=total == 0, index=False)
+            if has_date:
+                write_month_partitions(df_labels, tmp_partition_dir, append=True)
+
+            total += len(df_labels)
+            print(f"  ✓ Labeled {total} headlines ({time.time() - start_time:.1f}s elapsed)")
+    except BaseException:
+        remove_temporary_outputs()
+        raise
+
+    if total == 0:
+        remove_temporary_outputs()
+        print("⚠️ No headlines were labeled; previous outputs left in place.")
+        return
+
+    os.replace(tmp_csv, output_csv)
+    if has_date:
+        # partition_dir was checked above to hold only distilled partitions
+        if os.path.isdir(partition_dir):
+            shutil.rmtree(partition_dir)
+        os.replace(tmp_partition_dir, partition_dir)
+
+    print(f"✅ {total} headlines labeled in {time.time() - start_time:.1f}s and saved to {output_csv}")
+    if has_date:
+        print(f"Monthly partitions saved to {partition_dir}/ (plot them by setting partition_dir in ChangeOverTime.py)")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Distilled fast-path classifier trained from BART labels")
+    subparsers = parser.add_subparsers(dest="command", required=True)
+
+    train_parser = subparsers.add_parser("train", help="fit one linear model per label family")
+    train_parser.add_argument("--sources", nargs="+", default=TRAINING_SOURCES,
+                              help="labeled CSV files or glob patterns to learn from")
+    train_parser.add_argument("--test-size", type=float, default=0.2,
+                              help="fraction of headlines held out to measure agreement with BART")
+    train_parser.add_argument("--random-state", type=int, default=42)
+
+    label_parser = subparsers.add_parser("label", help="label a headline CSV with the distilled model")
+    label_parser.add_argument("--input", default="europarl_headlines_max_5000.csv")
+    label_parser.add_argument("--output", default="distilled_labeled_headlines.csv")
+    label_parser.add_argument("--partition-dir", default="distilled_labeled_by_month",
+                              help="where to write month partitions when the input has dates")
+
+    args = parser.parse_args()
+    if args.command == "train":
+        train(args.sources, args.test_size, args.random_state)
+    else:
+        label(args.input, args.output, args.partition_dir)
@@ -0,0 +1,160 @@
+import pandas as pd
+import os
+import glob
+from itertools import islice
+
+# Shared CSV ingestion helpers used by the labeling and plotting scripts.
+# Everything here reads in fixed-size chunks and only the columns that are
+# actually needed, so memory stays bounded on multi-million-row archives.
+
+# Number of rows read from disk at a time
+CHUNK_SIZE = 50_000
+
+# Explicit dtypes for the columns we know about (avoids pandas type inference)
+HEADLINE_DTYPES = {
+    "Headline": "string",
+    "Date": "string",
+}
+
+# Labeled results are written here as one CSV per month (e.g. 2025-03.csv)
+PARTITION_DIR = "labeled_with_dates"
+UNDATED_PARTITION = "undated"
+DATE_FORMAT = "%Y-%m-%d"
+
+LABEL_DTYPES = {
+    "headline": "string",
+    "date": "string",
+    "topic": "category",
+    "tone": "category",
+    "frame": "category",
+    "topic_confidence": "float32",
+    "tone_confidence": "float32",
+    "frame_confidence": "float32",
+}
+
+
+def check_file_exists(file_path, message):
+    if not os.path.exists(file_path):
+        raise FileNotFoundError(f"File '{file_path}' not found. {message}")
+
+
+def read_csv_columns(file_path):
+    # Read only the header row
+    return pd.read_csv(file_path, nrows=0).columns.tolist()
+
+
+def iter_csv_chunks(file_path, columns, dtypes=None, chunk_size=CHUNK_SIZE):
+    # Stream only the requested columns, CHUNK_SIZE rows at a time
+    dtypes = dtypes or {}
+    reader = pd.read_csv(
+        file_path,
+        usecols=columns,
+        dtype={col: dtypes[col] for col in columns if col in dtypes},
+        chunksize=chunk_size,
+    )
+    with reader:
+        for chunk in reader:
+            yield chunk
+
+
+def iter_headline_rows(file_path, limit=None, chunk_size=CHUNK_SIZE):
+    # Lazily yield (headline, date) pairs; date is None if the file has no Date column
+    has_date = "Date" in read_csv_columns(file_path)
+    columns = ["Headline", "Date"] if has_date else ["Headline"]
+
+    def generate():
+        for chunk in iter_csv_chunks(file_path, columns, HEADLINE_DTYPES, chunk_size):
+            chunk = chunk.dropna(subset=["Headline"])
+            dates = chunk["Date"] if has_date else [None] * len(chunk)
+            for headline, date in zip(chunk["Headline"], dates):
+                yield headline, (None if pd.isna(date) else date)
+
+    return islice(generate(), limit)
+
+
+def count_rows(file_path, column="Headline", chunk_size=CHUNK_SIZE):
+    # Count non-empty rows without holding the file in memory
+    total = 0
+    for chunk in iter_csv_chunks(file_path, [column], HEADLINE_DTYPES, chunk_size):
+        total += int(chunk[column].notna().sum())
+    return total
+
+
+def count_labels(file_path, label_column, chunk_size=CHUNK_SIZE):
+    # Accumulate value counts chunk by chunk instead of loading the whole column
+    counts = None
+    for chunk in iter_csv_chunks(file_path, [label_column], LABEL_DTYPES, chunk_size):
+        chunk_counts = chunk[label_column].astype("string").value_counts()
+        counts = chunk_counts if counts is None else counts.add(chunk_counts, fill_value=0)
+    if counts is None:
+        return pd.Series(dtype="int64")
+    return counts.astype("int64").sort_values(ascending=False)
+
+
+def write_month_partitions(df, partition_dir=PARTITION_DIR, append=False):
+    # Split labeled results by month so time-range queries only read what they need.
+    # Dates are parsed once here and stored as YYYY-MM-DD so readers can skip inference.
+    # Partitions accumulate across runs: new rows are merged into the existing month
+    # file and de-duplicated on (headline, date), the latest label winning. Months a
+    # run does not touch are left as they are.
+    # append=True is for chunked writers filling a fresh directory of their own: rows
+    # are appended as they are, without re-reading the month file or de-duplicating.
+    os.makedirs(partition_dir, exist_ok=True)
+    df = df.copy()
+    dates = pd.to_datetime(df["date"], errors="coerce")
+    df["date"] = dates.dt.strftime(DATE_FORMAT)
+    months = dates.dt.strftime("%Y-%m").fillna(UNDATED_PARTITION)
+
+    written = []
+    for month, partition in df.groupby(months, sort=True):
+        partition_path = os.path.join(partition_dir, f"{month}.csv")
+        if append and os.path.exists(partition_path):
+            partition.to_csv(partition_path, mode="a", header=False, index=False)
+            written.append(partition_path)
+            continue
+        if os.path.exists(partition_path):
+            existing = pd.read_csv(partition_path, dtype={"headline": "string", "date": "string"})
+            partition = pd.concat([existing, partition], ignore_index=True)
+            partition = partition.drop_duplicates(subset=["headline", "date"], keep="last")
+        partition.to_csv(partition_path, index=False)
+        written.append(partition_path)
+    return written
+
+
+def merge_month_partitions(source_dir, partition_dir=PARTITION_DIR):
+    # Merge a directory of freshly appended partitions into partition_dir, one month
+    # file at a time, so chunked writers pay the merge once per month rather than per chunk
+    written = []
+    for source_path in sorted(glob.glob(os.path.join(source_dir, "*.csv"))):
+        partition = pd.read_csv(source_path, dtype={"headline": "string", "date": "string"})
+        written.extend(write_month_partitions(partition, partition_dir))
+    return written
+
+
+def list_month_partitions(partition_dir=PARTITION_DIR, start_month=None, end_month=None):
+    # Return partition files whose month (YYYY-MM) falls in [start_month, end_month].
+    # The undated partition is only included when no month bound is set.
+    paths = []
+    for partition_path in sorted(glob.glob(os.path.join(partition_dir, "*.csv"))):
+        month = os.path.splitext(os.path.basename(partition_path))[0]
+        if month == UNDATED_PARTITION:
+            if not start_month and not end_month:
+                paths.append(partition_path)
+            continue
+        if start_month and month < start_month:
+            continue
+        if end_month and month > end_month:
+            continue
+        paths.append(partition_path)
+    return paths
+
+
+def read_month_partitions(columns, partition_dir=PARTITION_DIR, start_month=None, end_month=None):
+    # Load only the partitions (and columns) covering the requested months
+    chunks = []
+    for partition_path in list_month_partitions(partition_dir, start_month, end_month):
+        chunks.extend(iter_csv_chunks(partition_path, columns, LABEL_DTYPES))
+    df = pd.concat(chunks, ignore_index=True) if chunks else pd.DataFrame(columns=columns)
+    if "date" in df.columns:
+        df["date"] = pd.to_datetime(df["date"], format=DATE_FORMAT, errors="coerce")
+    return df
@@ -0,0 +1,18 @@
+# Candidate labels and hypothesis template for each label family, used by the
+# classification server and the approximate statistics. Mirrors the lists and
+# hypotheses in the labeling scripts. Kept free of torch/transformers imports.
+
+LABEL_FAMILIES = {
+    "topic": {
+        "labels": ["Economy", "Foreign Policy", "Human Rights", "Environment", "Security", "Technology", "EU Governance"],
+        "template": "This text is about {label}.",
+    },
+    "tone": {
+        "labels": ["Neutral", "Urgent", "Optimistic", "Conflict-Oriented", "Critical", "Supportive"],
+        "template": "The tone of this text is {label}.",
+    },
+    "frame": {
+        "labels": ["Humanitarian", "Security", "Legalistic", "Economic", "Nationalist", "Technocratic"],
+        "template": "This text uses a {label} frame.",
+    },
+}
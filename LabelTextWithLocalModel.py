@@ -2,8 +2,8 @@ import pandas as pd
 import json
 import torch
 import time
-import os
 from transformers import BartForSequenceClassification, BartTokenizer
+from HeadlineIO import check_file_exists, iter_headline_rows, write_month_partitions, PARTITION_DIR
 
 # Load model and tokenizer directly
 model_name = "facebook/bart-large-mnli"
@@ -23,14 +23,15 @@ frame_labels = ["Humanitarian", "Security", "Legalistic", "Economic", "Nationali
 
 # Check if the file exists before starting
 file_path = "europarl_headlines_max_5000.csv"
-if not os.path.exists(file_path):
-    raise FileNotFoundError(f"Data file '{file_path}' not found. Please ensure the file exists in the current directory.")
+check_file_exists(file_path, "Please ensure the file exists in the current directory.")
 
-# Read your headlines
+# Define how many headlines to process (e.g., first 100)
+max_headlines = 100
+
+# Stream your headlines (and their article dates) in chunks
 print(f"Reading data from {file_path}")
-df = pd.read_csv(file_path)
-headlines = df["Headline"].tolist()
-print(f"Loaded {len(headlines)} headlines from CSV file")
+headlines_to_process = list(iter_headline_rows(file_path, limit=max_headlines))
+print(f"Loaded {len(headlines_to_process)} headlines from CSV file")
 
 # This will store the results
 results = []
@@ -38,10 +39,7 @@ results = []
 # Process headlines using local model
 print("Starting classification process (using local model)...")
 
-# Define how many headlines to process (e.g., first 100)
-headlines_to_process = headlines[:100]
-
-for i, headline in enumerate(headlines_to_process):
+for i, (headline, date) in enumerate(headlines_to_process):
     print(f"🔍 Classifying headline {i+1}/{len(headlines_to_process)}: {headline}")
     
     try:
@@ -105,6 +103,7 @@ for i, headline in enumerate(headlines_to_process):
         # Store the result
         results.append({
             "headline": headline,
+            "date": date,
             "topic": top_topic,
             "topic_confidence": round(top_topic_score, 4),
             "tone": top_tone, 
@@ -139,6 +138,9 @@ with open(output_json, "w", encoding="utf-8") as f:
 if results:
     df_labels = pd.DataFrame(results)
     df_labels.to_csv(output_csv, index=False)
+    # Also merge the results into the monthly partitions read by ChangeOverTime.py
+    partitions = write_month_partitions(df_labels)
+    print(f"Saved {len(partitions)} monthly partitions to {PARTITION_DIR}/")
     print(f"✅ Process completed. {len(results)} headlines classified and saved locally.")
 else:
     print("⚠️ No results were collected. Check the errors above.")
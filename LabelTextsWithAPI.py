@@ -3,26 +3,33 @@ import pandas as pd
 import json
 import time
 import os
+from HeadlineIO import check_file_exists, iter_headline_rows, write_month_partitions, PARTITION_DIR
 
 # Set up your Hugging Face API Key and model
 API_TOKEN = "YourAPI"
 # Using a better model specifically for zero-shot classification
-MODEL_URL = "https://api-inference.huggingface.co/models/facebook/bart-large-mnli"
+HF_MODEL_URL = "https://api-inference.huggingface.co/models/facebook/bart-large-mnli"
+# Set CLASSIFIER_URL to use a local ClassificationServer.py instead, e.g.
+#   CLASSIFIER_URL=http://127.0.0.1:8000/models/facebook/bart-large-mnli
+MODEL_URL = os.environ.get("CLASSIFIER_URL", HF_MODEL_URL)
+using_local_server = MODEL_URL != HF_MODEL_URL
+server_name = "the local classification server" if using_local_server else "Hugging Face servers"
 
 # Check if the file exists before starting
 file_path = "europarl_headlines_max_5000.csv"
-if not os.path.exists(file_path):
-    raise FileNotFoundError(f"Data file '{file_path}' not found. Please ensure the file exists in the current directory.")
+check_file_exists(file_path, "Please ensure the file exists in the current directory.")
 
 # Define candidate labels for classification
 topic_labels = ["Economy", "Foreign Policy", "Human Rights", "Environment", "Security", "Technology", "EU Governance"]
 tone_labels = ["Neutral", "Urgent", "Optimistic", "Conflict-Oriented", "Critical", "Supportive"]
 frame_labels = ["Humanitarian", "Security", "Legalistic", "Economic", "Nationalist", "Technocratic"]
 
-# Read your headlines locally
+# Define how many headlines to process (e.g., first 100)
+max_headlines = 100
+
+# Stream your headlines (and their article dates) locally in chunks
 print(f"Reading data from {file_path}")
-df = pd.read_csv(file_path)
-headlines = df["Headline"].tolist()
+headlines = list(iter_headline_rows(file_path, limit=max_headlines))
 print(f"Loaded {len(headlines)} headlines from CSV file")
 
 # Prepare headers for API request
@@ -34,10 +41,10 @@ headers = {
 # This will store the results
 results = []
 
-# Process headlines - sending each one to Hugging Face servers
-print("Starting classification process (runs on Hugging Face servers)...")
-for i, headline in enumerate(headlines[:100]):  # Start with first 100 headlines
-    print(f"🔍 Classifying headline {i+1}/{min(100, len(headlines))}: {headline}")
+# Process headlines - sending each one to Hugging Face servers (or the local server)
+print(f"Starting classification process (runs on {server_name} at {MODEL_URL})...")
+for i, (headline, date) in enumerate(headlines):  # Start with first max_headlines headlines
+    print(f"🔍 Classifying headline {i+1}/{len(headlines)}: {headline}")
     
     try:
         # Prepare the request payload for BART zero-shot classification
@@ -85,6 +92,7 @@ for i, headline in enumerate(headlines[:100]):  # Start with first 100 headlines
                                 # Store the result locally
                                 results.append({
                                     "headline": headline,
+                                    "date": date,
                                     "topic": top_topic,
                                     "topic_confidence": round(top_topic_score, 4),
                                     "tone": top_tone,
@@ -127,12 +135,13 @@ for i, headline in enumerate(headlines[:100]):  # Start with first 100 headlines
         print(f"× Error processing headline: {e}")
 
     # Save results after each successful classification to avoid losing progress
-    if results and (i % 10 == 0 or i == len(headlines[:100]) - 1):  # Save every 10 processed headlines and at the end
+    if results and (i % 10 == 0 or i == len(headlines) - 1):  # Save every 10 processed headlines and at the end
         with open("labeled_headlines_progress.json", "w", encoding="utf-8") as f:
             json.dump(results, f, indent=2)
         print(f"Progress saved: {len(results)} headlines processed so far")
 
-    time.sleep(1)  # Wait between requests to avoid rate limiting, adjust as needed
+    if not using_local_server:
+        time.sleep(1)  # Wait between requests to avoid rate limiting, adjust as needed
 
 # Save the final results locally
 output_json = "labeled_headlines.json"
@@ -147,8 +156,11 @@ with open(output_json, "w", encoding="utf-8") as f:
 if results:  # Only create DataFrame if we have results
     df_labels = pd.DataFrame(results)
     df_labels.to_csv(output_csv, index=False)
+    # Also merge the results into the monthly partitions read by ChangeOverTime.py
+    partitions = write_month_partitions(df_labels)
+    print(f"Saved {len(partitions)} monthly partitions to {PARTITION_DIR}/")
     print(f"✅ Process completed. {len(results)} headlines classified and saved locally.")
 else:
     print("⚠️ No results were collected. Check the errors above.")
 
-print(f"Summary: Data was read locally, processed on Hugging Face servers, and results saved locally.")
+print(f"Summary: Data was read locally, processed on {server_name}, and results saved locally.")
@@ -3,8 +3,14 @@ import json
 import torch
 import time
 import os
+import shutil
+import tempfile
 from transformers import BartForSequenceClassification, BartTokenizer
 from datetime import datetime
+from HeadlineIO import (
+    check_file_exists, iter_headline_rows, count_rows, count_labels,
+    write_month_partitions, merge_month_partitions, CHUNK_SIZE,
+)
 
 # Load model and tokenizer directly
 print("Loading BART model for zero-shot classification...")
@@ -54,35 +60,39 @@ frame_labels = ["Humanitarian", "Security", "Legalistic", "Economic", "Nationali
 
 # Check if the file exists before starting
 file_path = "europarl_headlines_max_5000.csv"
-if not os.path.exists(file_path):
-    raise FileNotFoundError(f"Data file '{file_path}' not found. Please ensure the file exists in the current directory.")
+check_file_exists(file_path, "Please ensure the file exists in the current directory.")
 
-# Read your headlines
+# Count your headlines with a single-column chunked pass; they are streamed lazily below
 print(f"Reading data from {file_path}")
-df = pd.read_csv(file_path)
-headlines = df["Headline"].tolist()
-print(f"Loaded {len(headlines)} headlines from CSV file")
+total_headlines = count_rows(file_path)
+print(f"Found {total_headlines} headlines in CSV file")
 
 # Create a timestamp for output files
 timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
 
-# This will store the results
-results = []
+# Results are appended to a JSON Lines progress file in small batches instead of
+# being kept in memory, so long runs stay bounded
+progress_file = f"rhetorical_analysis_progress_{timestamp}.jsonl"
+pending_results = []
+processed = 0
 
 # Process headlines using local model
 print("Starting rhetorical strategy detection (using local model)...")
 start_time = time.time()
 
 # Process all headlines (or set a custom limit)
-# headlines_to_process = headlines[:10]  # For testing with just 10
-headlines_to_process = headlines  # Process all headlines
+# max_headlines = 10  # For testing with just 10
+max_headlines = None  # Process all headlines
+num_to_process = total_headlines if max_headlines is None else min(max_headlines, total_headlines)
+headlines_to_process = iter_headline_rows(file_path, limit=max_headlines)
 
-for i, headline in enumerate(headlines_to_process):
-    print(f"🔍 Analyzing headline {i+1}/{len(headlines_to_process)}: {headline}")
+for i, (headline, date) in enumerate(headlines_to_process):
+    print(f"🔍 Analyzing headline {i+1}/{num_to_process}: {headline}")
     
     try:
         headline_analysis = {
             "headline": headline,
+            "date": date,
             "topic": {},
             "tone": {},
             "frame": {},
@@ -186,16 +196,17 @@ for i, headline in enumerate(headlines_to_process):
         
         headline_analysis["rhetoric"] = rhetorical_analysis
         
-        # Store the complete analysis
-        results.append(headline_analysis)
+        # Store the complete analysis until the next progress save
+        pending_results.append(headline_analysis)
+        processed += 1
         
         # Print progress update with timing information
         elapsed = time.time() - start_time
         avg_time_per_headline = elapsed / (i + 1)
-        remaining_headlines = len(headlines_to_process) - (i + 1)
+        remaining_headlines = num_to_process - (i + 1)
         est_time_remaining = remaining_headlines * avg_time_per_headline
         
-        print(f"  ✓ Analyzed headline {i+1}/{len(headlines_to_process)}")
+        print(f"  ✓ Analyzed headline {i+1}/{num_to_process}")
         print(f"    Topic: {headline_analysis['topic']['top_match']} ({headline_analysis['topic']['score']:.4f})")
         print(f"    Tone: {headline_analysis['tone']['top_match']} ({headline_analysis['tone']['score']:.4f})")
         print(f"    Frame: {headline_analysis['frame']['top_match']} ({headline_analysis['frame']['score']:.4f})")
@@ -206,61 +217,113 @@ for i, headline in enumerate(headlines_to_process):
     except Exception as e:
         print(f"× Error processing headline: {e}")
     
-    # Save results periodically to avoid losing progress
-    if results and (i % 10 == 0 or i == len(headlines_to_process) - 1):
-        progress_file = f"rhetorical_analysis_progress_{timestamp}.json"
-        with open(progress_file, "w", encoding="utf-8") as f:
-            json.dump(results, f, indent=2)
-        print(f"Progress saved: {len(results)}/{len(headlines_to_process)} headlines processed")
+    # Append results periodically to avoid losing progress
+    if pending_results and (i % 10 == 0 or i == num_to_process - 1):
+        with open(progress_file, "a", encoding="utf-8") as f:
+            for item in pending_results:
+                f.write(json.dumps(item) + "\n")
+        pending_results = []
+        print(f"Progress saved: {processed}/{num_to_process} headlines processed")
+
+# Flush anything left over (e.g. if the last headline failed)
+if pending_results:
+    with open(progress_file, "a", encoding="utf-8") as f:
+        for item in pending_results:
+            f.write(json.dumps(item) + "\n")
+    pending_results = []
 
 # Calculate total processing time
 total_time = time.time() - start_time
 print(f"Total processing time: {total_time/60:.2f} minutes")
 
-# Save the final results
+
+def iter_progress_results():
+    # Read the analyses back from the progress file one at a time
+    if not os.path.exists(progress_file):
+        return
+    with open(progress_file, encoding="utf-8") as f:
+        for line in f:
+            if line.strip():
+                yield json.loads(line)
+
+
+if processed == 0:
+    print("⚠️ No results were collected. Check the errors above.")
+    raise SystemExit(1)
+
+# Save the final results, streamed from the progress file into a JSON array
 output_json = f"rhetorical_analysis_complete_{timestamp}.json"
 
 print(f"Saving final results to {output_json}")
 with open(output_json, "w", encoding="utf-8") as f:
-    json.dump(results, f, indent=2)
+    f.write("[\n")
+    for n, item in enumerate(iter_progress_results()):
+        if n:
+            f.write(",\n")
+        f.write(json.dumps(item, indent=2))
+    f.write("\n]\n")
 
-# Create a more structured CSV version with just the top matches
+# Create a more structured CSV version with just the top matches, CHUNK_SIZE rows at a time
 print("Creating CSV summary with top matches...")
-csv_data = []
+output_csv = f"rhetorical_analysis_summary_{timestamp}.csv"
+partition_dir = "rhetorical_analysis_by_month"
 
-for item in results:
-    row = {
-        "headline": item["headline"],
-        "topic": item["topic"]["top_match"],
-        "topic_score": item["topic"]["score"],
-        "tone": item["tone"]["top_match"],
-        "tone_score": item["tone"]["score"],
-        "frame": item["frame"]["top_match"],
-        "frame_score": item["frame"]["score"]
-    }
-    
-    # Add rhetorical strategies
-    for category in rhetoric_categories:
-        row[f"rhetoric_{category}"] = item["rhetoric"][category]["top_match"]
-        row[f"rhetoric_{category}_score"] = item["rhetoric"][category]["score"]
-    
-    csv_data.append(row)
+# Chunks are appended to a staging directory first, then merged into the monthly
+# partitions (accumulated across runs) once per month
+staging_dir = tempfile.mkdtemp(prefix="rhetorical_analysis_partitions_")
 
-df_results = pd.DataFrame(csv_data)
-output_csv = f"rhetorical_analysis_summary_{timestamp}.csv"
-df_results.to_csv(output_csv, index=False)
 
-print(f"✅ Process completed. {len(results)} headlines analyzed and saved.")
+def write_summary_chunk(csv_data, first_chunk):
+    df_chunk = pd.DataFrame(csv_data)
+    df_chunk.to_csv(output_csv, mode="w" if first_chunk else "a", header=first_chunk, index=False)
+    write_month_partitions(df_chunk, staging_dir, append=True)
+
+
+try:
+    csv_data = []
+    first_chunk = True
+    for item in iter_progress_results():
+        row = {
+            "headline": item["headline"],
+            "date": item["date"],
+            "topic": item["topic"]["top_match"],
+            "topic_score": item["topic"]["score"],
+            "tone": item["tone"]["top_match"],
+            "tone_score": item["tone"]["score"],
+            "frame": item["frame"]["top_match"],
+            "frame_score": item["frame"]["score"]
+        }
+        
+        # Add rhetorical strategies
+        for category in rhetoric_categories:
+            row[f"rhetoric_{category}"] = item["rhetoric"][category]["top_match"]
+            row[f"rhetoric_{category}_score"] = item["rhetoric"][category]["score"]
+        
+        csv_data.append(row)
+        if len(csv_data) >= CHUNK_SIZE:
+            write_summary_chunk(csv_data, first_chunk)
+            csv_data = []
+            first_chunk = False
+
+    if csv_data:
+        write_summary_chunk(csv_data, first_chunk)
+
+    partitions = merge_month_partitions(staging_dir, partition_dir)
+    print(f"Merged {len(partitions)} monthly partitions into {partition_dir}/")
+finally:
+    shutil.rmtree(staging_dir)
+
+print(f"✅ Process completed. {processed} headlines analyzed and saved.")
 print(f"Full JSON results: {output_json}")
 print(f"CSV summary: {output_csv}")
 
 # Optional: Create a simple analysis of most common rhetorical strategies
 print("\n--- Quick Summary of Results ---")
 for category in rhetoric_categories:
-    top_strategies = df_results[f"rhetoric_{category}"].value_counts().head(3)
+    top_strategies = count_labels(output_csv, f"rhetoric_{category}").head(3)
     print(f"\nTop 3 {category}:")
     for strategy, count in top_strategies.items():
-        percentage = (count / len(df_results)) * 100
+        percentage = (count / processed) * 100
         print(f"  {strategy}: {count} headlines ({percentage:.1f}%)")
 
 print("\nAnalysis complete!")
@@ -1,15 +1,10 @@
-import pandas as pd
 import matplotlib.pyplot as plt
 import seaborn as sns
-import os
+from HeadlineIO import check_file_exists, count_labels
 
 # Load your labeled data
 file_path = "structured_labeled_headlines.csv"
-if not os.path.exists(file_path):
-    raise FileNotFoundError(f"File '{file_path}' not found. Please ensure the classification step has completed.")
-
-# Read the CSV
-df = pd.read_csv(file_path)
+check_file_exists(file_path, "Please ensure the classification step has completed.")
 
 # Set style for better visuals
 sns.set(style="whitegrid")
@@ -17,7 +12,8 @@ plt.rcParams.update({'font.size': 12})
 
 # Function to plot label distribution
 def plot_label_distribution(label_column, title, color_palette):
-    label_counts = df[label_column].value_counts()
+    # Count labels chunk by chunk, reading only this column
+    label_counts = count_labels(file_path, label_column)
 
     plt.figure(figsize=(10, 6))
     sns.barplot(x=label_counts.index, y=label_counts.values, hue=label_counts.index, palette=color_palette, legend=False)
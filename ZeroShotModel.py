@@ -0,0 +1,58 @@
+import torch
+from transformers import BartForSequenceClassification, BartTokenizer
+
+# Batched zero-shot classification helpers built on bart-large-mnli, used by
+# ApproximateStatistics.py and ClassificationServer.py. Same hypotheses and
+# entailment scoring as LabelTextWithLocalModel.py, but all (headline, hypothesis)
+# pairs of a call are sent through the model in batches.
+
+MODEL_NAME = "facebook/bart-large-mnli"
+
+# Number of (headline, hypothesis) pairs per forward pass
+BATCH_SIZE = 32
+
+
+def load_model(model_name=MODEL_NAME):
+    # Load model and tokenizer and move them to the best available device
+    print(f"Loading {model_name} for zero-shot classification...")
+    model = BartForSequenceClassification.from_pretrained(model_name)
+    tokenizer = BartTokenizer.from_pretrained(model_name)
+
+    device = "cuda" if torch.cuda.is_available() else "cpu"
+    print(f"Using device: {device}")
+    model.to(device)
+    model.eval()
+    print("Model loaded successfully")
+    return model, tokenizer, device
+
+
+def entailment_scores(model, tokenizer, device, pairs, batch_size=BATCH_SIZE):
+    # Score a list of (premise, hypothesis) pairs; returns one entailment logit per pair
+    scores = []
+    for start in range(0, len(pairs), batch_size):
+        batch = pairs[start:start + batch_size]
+        premises = [premise for premise, _ in batch]
+        hypotheses = [hypothesis for _, hypothesis in batch]
+
+        inputs = tokenizer(premises, hypotheses, return_tensors="pt", padding=True, truncation=True)
+        inputs = {k: v.to(device) for k, v in inputs.items()}
+
+        with torch.no_grad():
+            outputs = model(**inputs)
+
+        # BART gives entailment vs contradiction scores (2 = entailment)
+        scores.extend(outputs.logits[:, 2].tolist())
+    return scores
+
+
+def classify_headlines(model, tokenizer, device, headlines, labels, template, batch_size=BATCH_SIZE):
+    # Returns, for each headline, its (label, score) pairs sorted by score in descending order
+    pairs = [(headline, template.format(label=label)) for headline in headlines for label in labels]
+    scores = entailment_scores(model, tokenizer, device, pairs, batch_size)
+
+    results = []
+    for i in range(len(headlines)):
+        headline_scores = list(zip(labels, scores[i * len(labels):(i + 1) * len(labels)]))
+        headline_scores.sort(key=lambda x: x[1], reverse=True)
+        results.append(headline_scores)
+    return results